@@ -1,5 +1,18 @@
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
 import streamlit as st
 
+# The Mock Interview app writes completed interviews to this store; the hub only reads its rollups
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "individual_apps", "Mock-Interview_Questions"))
+from results_store import ResultsStore
+
+# Interviews taken in the hosted Space are stored in that Space's container, so progress only shows up
+# here when MOCK_INTERVIEW_URL points at a Mock Interview app on this host sharing INTERVIEW_RESULTS_DB
+MOCK_INTERVIEW_URL = os.getenv("MOCK_INTERVIEW_URL")
+
 # --- PAGE CONFIGURATION ---
 st.set_page_config(
     page_title="EdTech & Career Counselling",
@@ -48,6 +61,10 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_results_store():
+    return ResultsStore()
+
 # --- SIDEBAR NAVIGATION ---
 # st.sidebar.image("https://cdn-icons-png.flaticon.com/512/2944/2944397.png", width=150)
 st.sidebar.title("📚 EdTech & Counselling")
@@ -69,6 +86,7 @@ if menu == "Home":
             username = st.text_input("Username")
             password = st.text_input("Password", type="password")
             if st.button("Login", key="login_btn"):
+                st.session_state['username'] = username
                 st.success(f"Welcome, {username}!")
 
     # Features Section
@@ -88,7 +106,7 @@ if menu == "Home":
 elif menu == "Mock Interview":
     st.title("📝 Mock Interview")
     st.write("Take AI-powered assessments to evaluate your skills.")
-    hf_space_url = "https://bonbibi-mock-interview-questions.hf.space"
+    hf_space_url = MOCK_INTERVIEW_URL or "https://bonbibi-mock-interview-questions.hf.space"
     st.components.v1.iframe(hf_space_url, width=1200, height=1000, scrolling=True)
 
 
@@ -103,7 +121,32 @@ elif menu == "AI Counsellor":
 elif menu == "Progress Monitoring":
     st.title("📊 Progress Tracking")
     st.write("View your test results and skill growth.")
-    st.line_chart([10, 20, 15, 30, 40, 35])  # Placeholder graph
+    if not MOCK_INTERVIEW_URL:
+        st.warning(
+            "Progress is only tracked when the Mock Interview app runs on the same host as this hub and both use "
+            "the same INTERVIEW_RESULTS_DB. Interviews taken in the hosted Mock Interview Space are not visible here; "
+            "see the README to run them together."
+        )
+    username = st.text_input("Username", value=st.session_state.get('username', ""))
+    store = get_results_store()
+    summary = store.user_summary(username) if username else None
+    if summary is None:
+        st.info("No completed mock interviews yet. Finish one in the Mock Interview section to see your progress here.")
+    else:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Interviews Completed", summary["interviews"])
+        col2.metric("Average Score", f"{summary['average_score']:.1f}")
+        col3.metric("Best Interview", f"{summary['best_interview_score']:.1f}")
+
+        series = store.score_series(username)
+        st.subheader("📈 Score Over Time")
+        st.line_chart(pd.DataFrame(
+            {"Average Score": [score for _, score in series]},
+            index=[datetime.fromtimestamp(completed_at) for completed_at, _ in series],
+        ))
+
+        st.subheader("🧩 Scores by Topic")
+        st.dataframe(pd.DataFrame(store.topic_averages(username)), use_container_width=True)
 
 # --- RECRUITMENT OPPORTUNITIES ---
 elif menu == "Recruitment":
@@ -1,69 +1,216 @@
+import os
+import time
+
 import gradio as gr
-from huggingface_hub import InferenceClient
+from history_manager import HistoryManager
+from inference_client import SingleAttemptInferenceClient
+from response_cache import ResponseCache
+from scheduler import FairScheduler
 
 """
 For more information on huggingface_hub Inference API support, please check the docs: https://huggingface.co/docs/huggingface_hub/v0.22.2/en/guides/inference
 """
-client = InferenceClient("HuggingFaceH4/zephyr-7b-beta")
+MODEL_ID = "HuggingFaceH4/zephyr-7b-beta"
+
+# Chats streamed at once by this process, and chats allowed to wait for a slot before new ones are rejected
+CONCURRENCY_LIMIT = int(os.getenv("CAREERGPS_CONCURRENCY_LIMIT", "200"))
+MAX_QUEUE_SIZE = int(os.getenv("CAREERGPS_MAX_QUEUE_SIZE", "1000"))
+
+# Prompt tokens sent per turn; older turns beyond this are collapsed into a summary.
+# The budget also shrinks so that prompt plus requested new tokens fit the context window.
+CONTEXT_WINDOW = int(os.getenv("CAREERGPS_CONTEXT_WINDOW", "4096"))
+PROMPT_TOKEN_BUDGET = int(os.getenv("CAREERGPS_PROMPT_TOKEN_BUDGET", "2048"))
+SUMMARY_MAX_TOKENS = 256
+
+# Seconds allowed to connect to the backend and between streamed chunks; the scheduler retries timeouts
+CONNECT_TIMEOUT = float(os.getenv("CAREERGPS_CONNECT_TIMEOUT", "10"))
+READ_TIMEOUT = float(os.getenv("CAREERGPS_READ_TIMEOUT", "60"))
+
+# Budget for the shared inference backend, shared fairly between sessions by the scheduler
+REQUESTS_PER_MINUTE = float(os.getenv("CAREERGPS_REQUESTS_PER_MINUTE", "60"))
+REQUEST_BURST = int(os.getenv("CAREERGPS_REQUEST_BURST", "10"))
+MAX_UPSTREAM_STREAMS = int(os.getenv("CAREERGPS_MAX_UPSTREAM_STREAMS", "32"))
+
+# First-turn answers are cached when sampling is near-deterministic (or the user opts in)
+CACHE_MAX_TEMPERATURE = 0.3
+CACHE_TTL_SECONDS = int(os.getenv("CAREERGPS_CACHE_TTL_SECONDS", str(24 * 3600)))
+CACHE_MAX_ENTRIES = int(os.getenv("CAREERGPS_CACHE_MAX_ENTRIES", "512"))
+
+# Streamed tokens are pushed to the UI at most every STREAM_FLUSH_INTERVAL seconds,
+# or sooner once STREAM_FLUSH_CHARS new characters have piled up
+STREAM_FLUSH_INTERVAL = 0.1
+STREAM_FLUSH_CHARS = 200
+
+
+async def stream_deltas(stream):
+    """Yields the text of each streamed chunk, skipping chunks without choices or content."""
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+async def replay_deltas(text, chunk_chars=16):
+    """Feeds a cached answer through the streaming path in token-sized pieces."""
+    for start in range(0, len(text), chunk_chars):
+        yield text[start:start + chunk_chars]
+
+
+async def coalesce_stream(deltas, flush_interval=STREAM_FLUSH_INTERVAL, flush_chars=STREAM_FLUSH_CHARS):
+    """Yields the growing response, but only once per flush rather than once per token.
+
+    Tokens are buffered in a list and the response string is rebuilt once per flush
+    instead of once per token, which keeps long answers cheap to stream.
+    """
+    parts = []
+    pending = 0
+    last_flush = time.monotonic()
+    async for delta in deltas:
+        parts.append(delta)
+        pending += len(delta)
+        now = time.monotonic()
+        if pending >= flush_chars or now - last_flush >= flush_interval:
+            yield "".join(parts)
+            pending = 0
+            last_flush = now
+    if pending or not parts:
+        yield "".join(parts)
 
 
-def respond(
+response_cache = ResponseCache(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+scheduler = FairScheduler(
+    requests_per_minute=REQUESTS_PER_MINUTE, burst=REQUEST_BURST, max_in_flight=MAX_UPSTREAM_STREAMS
+)
+
+
+def inference_client():
+    return SingleAttemptInferenceClient(MODEL_ID, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT)
+
+
+async def summarize_turns(previous_summary, turns, session_id):
+    """Folds the given (user, assistant) turns into the running summary of the conversation."""
+    transcript = "\n".join(
+        f"{speaker}: {text}" for turn in turns for speaker, text in zip(("User", "CareerGPS"), turn) if text
+    )
+    prompt = (
+        f"Summary so far:\n{previous_summary or '(none)'}\n\nNew messages:\n{transcript}\n\n"
+        "Update the summary so it keeps the user's background, goals, constraints and the advice already given."
+    )
+    client = inference_client()
+    try:
+        # Charged to the chat whose history is being summarized, like its answers
+        async with scheduler.slot(session_id, SUMMARY_MAX_TOKENS):
+            output = await scheduler.call_with_retries(lambda: client.chat_completion(
+                [
+                    {"role": "system", "content": "You write concise summaries of career-counselling conversations."},
+                    {"role": "user", "content": prompt},
+                ],
+                max_tokens=SUMMARY_MAX_TOKENS,
+                temperature=0.3,
+            ))
+        return output.choices[0].message.content.strip()
+    finally:
+        await client.close()
+
+
+history_manager = HistoryManager(
+    MODEL_ID, summarize_turns, prompt_budget=PROMPT_TOKEN_BUDGET, summary_max_tokens=SUMMARY_MAX_TOKENS
+)
+
+
+async def respond(
     message,
     history: list[tuple[str, str]],
     system_message,
     max_tokens,
     temperature,
     top_p,
+    use_cache=False,
+    request: gr.Request = None,
 ):
-    messages = [{"role": "system", "content": system_message}]
+    session_id = request.session_hash if request is not None else "anonymous"
 
-    for val in history:
-        if val[0]:
-            messages.append({"role": "user", "content": val[0]})
-        if val[1]:
-            messages.append({"role": "assistant", "content": val[1]})
+    cache_key = None
+    if not history and (use_cache or temperature <= CACHE_MAX_TEMPERATURE):
+        cache_key = ResponseCache.make_key(system_message, message, max_tokens, temperature, top_p)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            async for response in coalesce_stream(replay_deltas(cached)):
+                yield response
+            return
 
-    messages.append({"role": "user", "content": message})
+    messages = await history_manager.build_messages(
+        system_message,
+        history,
+        message,
+        budget=min(PROMPT_TOKEN_BUDGET, CONTEXT_WINDOW - max_tokens),
+        session_id=session_id,
+    )
 
-    response = ""
+    # A client per chat: closing it drops the HTTP connection, so when Gradio cancels this
+    # handler (tab closed, chat stopped or replaced) the upstream generation stops too
+    client = inference_client()
+    try:
+        # The slot is held while the answer streams, and is weighted by how long it may get
+        async with scheduler.slot(session_id, max_tokens):
+            stream = await scheduler.call_with_retries(lambda: client.chat_completion(
+                messages,
+                max_tokens=max_tokens,
+                stream=True,
+                temperature=temperature,
+                top_p=top_p,
+            ))
 
-    for message in client.chat_completion(
-        messages,
-        max_tokens=max_tokens,
-        stream=True,
-        temperature=temperature,
-        top_p=top_p,
-    ):
-        token = message.choices[0].delta.content
+            response = ""
+            async for response in coalesce_stream(stream_deltas(stream)):
+                yield response
+        # Only answers that streamed to completion are cached; a cancelled chat never gets here
+        if cache_key is not None and response:
+            response_cache.put(cache_key, response)
+    finally:
+        await client.close()
 
-        response += token
-        yield response
+
+async def backend_metrics():
+    # Async so it runs on the event loop that owns the scheduler's state
+    return {**scheduler.metrics(), "response_cache": response_cache.metrics()}
 
 
 """
 For information on how to customize the ChatInterface, peruse the gradio docs: https://www.gradio.app/docs/chatinterface
 """
-demo = gr.ChatInterface(
-    respond,
-    additional_inputs=[
-        gr.Textbox(
-            value="You are CareerGPS, an AI-powered career mentor designed to provide users with personalized career guidance. Your mission is to help users identify their strengths and areas for improvement, explore diverse career options, and develop actionable strategies for professional growth. Deliver customized learning resources, practical advice, and insightful feedback to empower users in their career journeys.",
-            label="System message",
-            show_label=True,
-            lines=6,  # Adjusted for better readability
-        ),
-        gr.Slider(minimum=1, maximum=2048, value=512, step=1, label="Max new tokens"),
-        gr.Slider(minimum=0.1, maximum=4.0, value=0.7, step=0.1, label="Temperature"),
-        gr.Slider(
-            minimum=0.1,
-            maximum=1.0,
-            value=0.95,
-            step=0.05,
-            label="Top-p (nucleus sampling)",
-        ),
-    ],
+with gr.Blocks() as demo:
+    gr.ChatInterface(
+        respond,
+        additional_inputs=[
+            gr.Textbox(
+                value="You are CareerGPS, an AI-powered career mentor designed to provide users with personalized career guidance. Your mission is to help users identify their strengths and areas for improvement, explore diverse career options, and develop actionable strategies for professional growth. Deliver customized learning resources, practical advice, and insightful feedback to empower users in their career journeys.",
+                label="System message",
+                show_label=True,
+                lines=6,  # Adjusted for better readability
+            ),
+            gr.Slider(minimum=1, maximum=2048, value=512, step=1, label="Max new tokens"),
+            gr.Slider(minimum=0.1, maximum=4.0, value=0.7, step=0.1, label="Temperature"),
+            gr.Slider(
+                minimum=0.1,
+                maximum=1.0,
+                value=0.95,
+                step=0.05,
+                label="Top-p (nucleus sampling)",
+            ),
+            gr.Checkbox(
+                value=False,
+                label=f"Reuse cached answers for common opening questions (always on at temperature <= {CACHE_MAX_TEMPERATURE})",
+            ),
+        ],
     
-)
+    )
+
+    with gr.Accordion("Backend status", open=False):
+        backend_status = gr.JSON(label="Inference scheduler")
+        refresh_status = gr.Button("Refresh")
+    refresh_status.click(backend_metrics, outputs=backend_status, queue=False)
+    demo.load(backend_metrics, outputs=backend_status, queue=False)
+demo.queue(default_concurrency_limit=CONCURRENCY_LIMIT, max_size=MAX_QUEUE_SIZE)
 
 if __name__ == "__main__":
     demo.launch() 
\ No newline at end of file
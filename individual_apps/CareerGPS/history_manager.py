@@ -0,0 +1,123 @@
+import hashlib
+import logging
+from collections import OrderedDict
+from functools import lru_cache
+
+# Rough chat-template overhead per message (role marker and end-of-turn token) for zephyr
+MESSAGE_OVERHEAD_TOKENS = 4
+SUMMARY_HEADER = "\n\nSummary of the earlier conversation:\n"
+
+
+class HistoryManager:
+    """Fits chat history into a token budget before it is sent to the model.
+
+    The system message, the new user message and as many of the most recent turns as fit
+    are sent verbatim. Older turns are collapsed into a summary produced by
+    `summarize(previous_summary, turns, session_id)`. Summaries are cached per history prefix, so each
+    turn is summarized once when it falls out of the window and never again.
+    """
+
+    def __init__(self, tokenizer_id, summarize, prompt_budget=2048, summary_max_tokens=256, summary_cache_size=1024):
+        self.tokenizer_id = tokenizer_id
+        self.summarize = summarize
+        self.prompt_budget = prompt_budget
+        self.summary_max_tokens = summary_max_tokens
+        self.summary_cache_size = summary_cache_size
+        self._summaries = OrderedDict()
+        # Loaded up front so the first chat does not block the event loop on a download
+        self._tokenizer = self._load_tokenizer(tokenizer_id)
+        # Histories are resent every turn, so token counts are memoized per text
+        self.count_tokens = lru_cache(maxsize=65536)(self._count_tokens)
+
+    @staticmethod
+    def _load_tokenizer(tokenizer_id):
+        try:
+            from tokenizers import Tokenizer
+            return Tokenizer.from_pretrained(tokenizer_id)
+        except Exception as e:
+            logging.warning(f"Could not load tokenizer for {tokenizer_id}, estimating token counts: {e}")
+            return None
+
+    def _count_tokens(self, text):
+        if self._tokenizer is None:
+            return len(text) // 4 + 1
+        return len(self._tokenizer.encode(text, add_special_tokens=False).ids)
+
+    def turn_tokens(self, turn):
+        return sum(self.count_tokens(text) + MESSAGE_OVERHEAD_TOKENS for text in turn if text)
+
+    async def build_messages(self, system_message, history, message, budget=None, session_id=None):
+        """Returns the chat messages for this turn within the token budget.
+
+        Only the system message and the new message are never cut, so the budget can
+        still be exceeded when those two alone do not fit.
+        """
+        budget = self.prompt_budget if budget is None else budget
+        turns = [tuple(turn) for turn in history]
+        turn_costs = [self.turn_tokens(turn) for turn in turns]
+        remaining = (
+            budget
+            - self.count_tokens(system_message)
+            - self.count_tokens(message)
+            - 2 * MESSAGE_OVERHEAD_TOKENS
+        )
+        summary_reserve = 0
+        if sum(turn_costs) > remaining:
+            # Some turns will be summarized, so keep room for the longest summary the model may write
+            summary_reserve = self.summary_max_tokens + self.count_tokens(SUMMARY_HEADER)
+            remaining -= summary_reserve
+
+        # Walk back from the newest turn; everything before `split` gets summarized
+        split = len(turns)
+        while split > 0 and turn_costs[split - 1] <= remaining:
+            remaining -= turn_costs[split - 1]
+            split -= 1
+
+        system_content = system_message
+        if split > 0:
+            summary = await self._summary_for(turns[:split], session_id)
+            if summary:
+                # Without the real tokenizer the estimate can put a summary over its reserve;
+                # the oldest verbatim turns then make way so the prompt still fits
+                overflow = self.count_tokens(SUMMARY_HEADER + summary) - summary_reserve - remaining
+                while overflow > 0 and split < len(turns):
+                    overflow -= turn_costs[split]
+                    split += 1
+                system_content += SUMMARY_HEADER + summary
+
+        messages = [{"role": "system", "content": system_content}]
+        for user_message, assistant_message in turns[split:]:
+            if user_message:
+                messages.append({"role": "user", "content": user_message})
+            if assistant_message:
+                messages.append({"role": "assistant", "content": assistant_message})
+        messages.append({"role": "user", "content": message})
+        return messages
+
+    async def _summary_for(self, turns, session_id):
+        # Prefix keys chain turn by turn, so the newest cached prefix can be extended incrementally
+        keys = []
+        digest = hashlib.sha256()
+        for turn in turns:
+            digest.update(repr(turn).encode("utf-8"))
+            keys.append(digest.hexdigest())
+
+        cached_upto, previous_summary = 0, ""
+        for i in range(len(keys), 0, -1):
+            if keys[i - 1] in self._summaries:
+                cached_upto, previous_summary = i, self._summaries[keys[i - 1]]
+                self._summaries.move_to_end(keys[i - 1])
+                break
+        if cached_upto == len(turns):
+            return previous_summary
+
+        try:
+            summary = await self.summarize(previous_summary, turns[cached_upto:], session_id)
+        except Exception as e:
+            logging.warning(f"Could not summarize earlier conversation, dropping it instead: {e}")
+            return previous_summary
+
+        self._summaries[keys[-1]] = summary
+        while len(self._summaries) > self.summary_cache_size:
+            self._summaries.popitem(last=False)
+        return summary
@@ -0,0 +1,46 @@
+import asyncio
+
+import aiohttp
+from huggingface_hub import AsyncInferenceClient
+from huggingface_hub.errors import InferenceTimeoutError
+
+
+async def _iter_lines(session, response):
+    # An abandoned stream is closed by the client's close(), which must not see the session twice
+    async for line in response.content:
+        yield line.strip()
+    await session.close()
+
+
+class SingleAttemptInferenceClient(AsyncInferenceClient):
+    """AsyncInferenceClient that makes exactly one HTTP attempt per call and never blocks the event loop.
+
+    huggingface_hub 0.25 answers a 503 ("model loading") inside `post` with a blocking
+    time.sleep(1) loop that only ends at a total timeout, and a total timeout would also cut
+    off long streams. Here 503s and timeouts are raised straight to the caller, so
+    FairScheduler.call_with_retries backs off with asyncio.sleep. The timeouts bound
+    connecting and each read, not the length of the answer.
+    """
+
+    def __init__(self, model, connect_timeout=10.0, read_timeout=60.0, **kwargs):
+        super().__init__(model, **kwargs)
+        self.request_timeout = aiohttp.ClientTimeout(connect=connect_timeout, sock_read=read_timeout)
+
+    async def post(self, *, json=None, data=None, model=None, task=None, stream=False):
+        url = self._resolve_url(model, task)
+        # Registered with the client, so close() still drops the connection of a cancelled chat
+        session = self._get_client_session()
+        try:
+            response = await session.post(url, json=json, data=data, proxy=self.proxies, timeout=self.request_timeout)
+            response.raise_for_status()
+            if stream:
+                return _iter_lines(session, response)
+            content = await response.read()
+        except asyncio.TimeoutError as error:
+            await session.close()
+            raise InferenceTimeoutError(f"Inference call timed out: {url}") from error
+        except BaseException:
+            await session.close()
+            raise
+        await session.close()
+        return content
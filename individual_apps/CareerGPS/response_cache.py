@@ -0,0 +1,50 @@
+import re
+import time
+from collections import OrderedDict
+
+
+def normalize_message(message):
+    """Makes trivially different phrasings of the same opening question share a cache entry."""
+    return re.sub(r"\s+", " ", message).strip().rstrip("?!. ").lower()
+
+
+class ResponseCache:
+    """LRU cache of complete answers with a time-to-live, plus hit-rate bookkeeping."""
+
+    def __init__(self, max_entries=512, ttl=24 * 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(system_message, message, max_tokens, temperature, top_p):
+        return (system_message.strip(), normalize_message(message), int(max_tokens), round(temperature, 2), round(top_p, 2))
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] > self.ttl:
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, response):
+        self._entries[key] = (time.monotonic(), response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def metrics(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
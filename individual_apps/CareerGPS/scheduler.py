@@ -0,0 +1,166 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+RETRYABLE_STATUSES = {429, 503}
+
+
+def error_status(error):
+    """HTTP status of an inference error, whether it comes from aiohttp or requests."""
+    status = getattr(error, "status", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self, cost=1):
+        self._refill()
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return True
+        return False
+
+    def delay_until(self, cost=1):
+        self._refill()
+        return max(0.0, (cost - self.tokens) / self.rate)
+
+    def drain(self):
+        """Empties the bucket, e.g. after the provider says we are over its limit."""
+        self._refill()
+        self.tokens = 0.0
+
+
+class FairScheduler:
+    """Admits requests to the shared inference backend fairly and within its rate limits.
+
+    Waiting requests are ordered by weighted fair queueing: each session's requests get a
+    virtual finish time advanced by their cost (the requested `max_tokens`), so a session
+    asking for long answers is served proportionally less often instead of starving the
+    others. A request is started only when the token bucket has budget and fewer than
+    `max_in_flight` requests are streaming. Must be used from a single event loop.
+    """
+
+    def __init__(self, requests_per_minute=60, burst=10, max_in_flight=32, max_retries=4,
+                 backoff_base=1.0, backoff_cap=30.0):
+        self.bucket = TokenBucket(requests_per_minute / 60.0, burst)
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._queue = []
+        self._sequence = itertools.count()
+        self._virtual_time = 0.0
+        self._last_finish = {}
+        self._in_flight = 0
+        self._wakeup = None
+        self._waits = deque(maxlen=1000)
+        self._started = 0
+        self._retries = 0
+        self._rate_limited = 0
+
+    @asynccontextmanager
+    async def slot(self, session_id, cost):
+        """Waits for this session's turn and holds an in-flight slot for the duration of the block."""
+        cost = max(1, int(cost))
+        finish = max(self._virtual_time, self._last_finish.get(session_id, 0.0)) + cost
+        self._last_finish[session_id] = finish
+        waiter = asyncio.get_running_loop().create_future()
+        enqueued = time.monotonic()
+        heapq.heappush(self._queue, (finish, next(self._sequence), waiter))
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Cancelled while queued the entry is skipped by _dispatch; if the slot was
+            # granted just before the cancellation it has to be handed back
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+        self._waits.append(time.monotonic() - enqueued)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self):
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        while self._queue and self._in_flight < self.max_in_flight:
+            finish, _, waiter = self._queue[0]
+            if waiter.done():
+                heapq.heappop(self._queue)
+                continue
+            if not self.bucket.try_take():
+                self._schedule_wakeup(self.bucket.delay_until())
+                return
+            heapq.heappop(self._queue)
+            self._virtual_time = max(self._virtual_time, finish)
+            self._in_flight += 1
+            self._started += 1
+            waiter.set_result(None)
+        if not self._queue:
+            # Nobody is waiting, so no session can be ahead of the virtual clock any more
+            self._last_finish.clear()
+
+    def _schedule_wakeup(self, delay):
+        if self._wakeup is None or self._wakeup.cancelled():
+            loop = asyncio.get_running_loop()
+            self._wakeup = loop.call_later(delay, self._on_wakeup)
+
+    def _on_wakeup(self):
+        self._wakeup = None
+        self._dispatch()
+
+    async def call_with_retries(self, call):
+        """Awaits `call()`, retrying 429/503 responses and timeouts with capped exponential backoff and full jitter."""
+        for attempt in itertools.count():
+            try:
+                return await call()
+            except Exception as e:
+                status = error_status(e)
+                retryable = status in RETRYABLE_STATUSES or isinstance(e, TimeoutError)
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                if status == 429:
+                    # Everyone shares the provider limit, so stop admitting new requests for a while too
+                    self._rate_limited += 1
+                    self.bucket.drain()
+                self._retries += 1
+                delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+                logging.warning(f"Inference backend returned {status or 'a timeout'}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                while not self.bucket.try_take():
+                    await asyncio.sleep(self.bucket.delay_until())
+
+    def metrics(self):
+        waits = sorted(self._waits)
+        return {
+            "queue_depth": sum(1 for _, _, waiter in self._queue if not waiter.done()),
+            "in_flight": self._in_flight,
+            "requests_started": self._started,
+            "retries": self._retries,
+            "rate_limited_responses": self._rate_limited,
+            "wait_seconds_avg": round(sum(waits) / len(waits), 3) if waits else 0.0,
+            "wait_seconds_p95": round(waits[int(0.95 * (len(waits) - 1))], 3) if waits else 0.0,
+        }
@@ -1,95 +1,240 @@
 import gradio as gr
 import logging
+import os
+import queue
+import threading
+import time
 from linkedin_jobs_scraper import LinkedinScraper
 from linkedin_jobs_scraper.events import Events, EventData, EventMetrics
 from linkedin_jobs_scraper.query import Query, QueryOptions, QueryFilters
 from linkedin_jobs_scraper.filters import RelevanceFilters, TimeFilters, OnSiteOrRemoteFilters
 import pandas as pd
+from browser_pool import BrowserPool
+from course_matcher import CourseMatcher
+from job_store import JobStore, search_key
 
 # Configure logging
 logging.basicConfig(filename="job_scraper.log", level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
-# Initialize job data storage
-job_data = []
-
-# Event Handlers
-def on_data(data: EventData):
-    job_data.append({
-        'Date Posted': data.date,
-        'Title': data.title,
-        'Company': data.company,
-        'Location': data.location,
-        'Job Link': data.link,
-        'Description Length': len(data.description),
-        'Description': data.description,
-    })
+# Warm browsers shared by every request; scrapers lease from here instead of launching Chrome
+MAX_BROWSERS = int(os.getenv("JOBSCRAPPER_MAX_BROWSERS", "5"))
+browser_pool = BrowserPool(
+    max_browsers=MAX_BROWSERS,
+    max_leases=int(os.getenv("JOBSCRAPPER_MAX_LEASES_PER_BROWSER", "50")),
+    max_memory_mb=int(os.getenv("JOBSCRAPPER_MAX_BROWSER_MEMORY_MB", "1024")),
+    page_load_timeout=100,
+)
+browser_pool.install()
+browser_pool.prewarm()
+
+# Searches run concurrently and each one needs at least one browser; admitting more than the pool holds
+# only makes their locations wait for a browser until the pool's acquire timeout fails them
+CONCURRENCY_LIMIT = int(os.getenv("JOBSCRAPPER_CONCURRENCY_LIMIT", str(MAX_BROWSERS)))
+MAX_WORKERS = 5
+
+# Results are pushed to the table every STREAM_BATCH_ROWS new jobs or STREAM_BATCH_SECONDS, whichever comes first
+STREAM_BATCH_ROWS = int(os.getenv("JOBSCRAPPER_STREAM_BATCH_ROWS", "10"))
+STREAM_BATCH_SECONDS = float(os.getenv("JOBSCRAPPER_STREAM_BATCH_SECONDS", "2"))
+
+TIME_FILTERS = {"From Past Month": TimeFilters.MONTH, "From Last 24 Hours": TimeFilters.DAY}
+TIME_FILTER_WINDOWS = {TimeFilters.DAY: 24 * 3600, TimeFilters.WEEK: 7 * 24 * 3600, TimeFilters.MONTH: 30 * 24 * 3600}
+
+# Repeated searches within the TTL are answered from the job store; "Last 24 Hours" results go stale fastest
+CACHE_TTL = {
+    TimeFilters.DAY: int(os.getenv("JOBSCRAPPER_CACHE_TTL_DAY", "900")),
+    TimeFilters.MONTH: int(os.getenv("JOBSCRAPPER_CACHE_TTL_MONTH", "21600")),
+}
+# Expired searches are shown at once and then topped up with postings newer than their watermark
+REFRESH_STALE = os.getenv("JOBSCRAPPER_REFRESH_STALE", "1") == "1"
+
+job_store = JobStore()
+
+# Offline course recommendations from the Smart-Course-Search catalogue; the column is left out if it is missing
+course_matcher = CourseMatcher.from_file(top_k=int(os.getenv("JOBSCRAPPER_RECOMMENDED_COURSES", "3")))
+
+COLUMNS = ['Date Posted', 'Title', 'Company', 'Location', 'Job Link', 'Description Length', 'Description']
+if course_matcher is not None:
+    COLUMNS.append('Recommended Courses')
+
+def job_key(link):
+    # The same posting is linked with different tracking parameters per search location
+    return link.split('?', 1)[0]
+
+def job_row(data: EventData):
+    # Plain list in COLUMNS order, so batches can be appended without building DataFrames
+    return [data.date, data.title, data.company, data.location, data.link, len(data.description), data.description]
+
+def add_recommendations(rows):
+    """Appends recommended courses to a batch of rows, scoring the whole batch in one matrix product."""
+    if course_matcher is None or not rows:
+        return
+    for row, matches in zip(rows, course_matcher.recommend([row[6] for row in rows])):
+        row.append("; ".join(course["title"] for course, _ in matches))
+
+def refresh_time_filter(since_seconds, time_filter):
+    """Narrowest LinkedIn time filter that still covers everything posted since the last scrape."""
+    for candidate in (TimeFilters.DAY, TimeFilters.WEEK):
+        if since_seconds <= TIME_FILTER_WINDOWS[candidate] <= TIME_FILTER_WINDOWS[time_filter]:
+            return candidate
+    return time_filter
+
+def error_note(scrape_errors):
+    """Tells the user the results may be incomplete, with the first error's one-line reason."""
+    if not scrape_errors:
+        return ""
+    reason = scrape_errors[0].strip().splitlines()[0] if scrape_errors[0].strip() else "unknown error"
+    return f" {len(scrape_errors)} scraping error(s), results may be incomplete: {reason}"
 
 def on_end():
     logging.info("[ON_END] Scraping completed.")
 
 # Scraper function
 def scrape_jobs(query, locations, time_filter):
-    global job_data
+    """Scrapes in a background thread and yields (table, message) as batches of new jobs arrive.
+
+    Searches run before are answered from the job store; once their TTL has passed only
+    postings newer than the previous scrape are fetched and appended.
+    """
+    rows = []
     try:
-        job_data = []
+        location_list = [location.strip() for location in locations.split(',') if location.strip()]
+        key = search_key(query, location_list, time_filter)
+        scrape_filter = TIME_FILTERS.get(time_filter, TimeFilters.MONTH)
+
+        cached = job_store.get_search(key, max_age=TIME_FILTER_WINDOWS[scrape_filter])
+        if cached is not None:
+            age = time.time() - cached["scraped_at"]
+            add_recommendations(cached["rows"])
+            if age < CACHE_TTL[scrape_filter]:
+                message = f"Jobs ({len(cached['rows'])}) served from cache, scraped {age / 60:.0f} min ago."
+                logging.info(message)
+                yield (pd.DataFrame(cached["rows"], columns=COLUMNS) if cached["rows"] else pd.DataFrame()), message
+                return
+            if not REFRESH_STALE:
+                cached = None
+
+        # Request-scoped sink: the scraper's worker threads enqueue postings, this generator dedupes them by link
+        pending = queue.Queue()
+        finished = object()
+        errors = []
+        # The scraper reports failed locations and postings through Events.ERROR instead of raising
+        scrape_errors = []
+        seen = set()
+        new_keys = []
+
+        if cached is not None:
+            rows = cached["rows"]
+            seen = {job_key(row[4]) for row in rows}
+            scrape_filter = refresh_time_filter(age, scrape_filter)
+            yield {"headers": COLUMNS, "data": rows}, f"Showing {len(rows)} cached jobs, checking for newer postings..."
+        cached_count = len(rows)
+        started_at = time.time()
+
+        def on_data(data: EventData):
+            pending.put(data)
+
+        def on_error(error):
+            scrape_errors.append(error)
+            logging.warning(f"[ON_ERROR] {error}")
 
         scraper = LinkedinScraper(
             chrome_executable_path=None,
             chrome_binary_location=None,
             chrome_options=None,
             headless=True,
-            max_workers=5,
+            max_workers=max(1, min(MAX_WORKERS, len(location_list))),
             slow_mo=0.8,
             page_load_timeout=100,
         )
 
         scraper.on(Events.DATA, on_data)
+        scraper.on(Events.ERROR, on_error)
         scraper.on(Events.END, on_end)
 
-        if time_filter == "From Past Month":
-            time_filter = TimeFilters.MONTH
-        elif time_filter == "From Last 24 Hours":
-            time_filter = TimeFilters.DAY
-        else:
-            time_filter = TimeFilters.MONTH  
-
         queries = [
             Query(
                 query=query,
                 options=QueryOptions(
-                    locations=locations.split(','),
+                    locations=[location],
                     apply_link=True,
                     skip_promoted_jobs=False,
                     page_offset=0,
                     limit=100,
                     filters=QueryFilters(
                         # relevance=RelevanceFilters.RECENT,
-                        time=time_filter,
+                        time=scrape_filter,
                     ),
                 ),
-            ),
+            )
+            for location in location_list
         ]
 
-        scraper.run(queries)
-        
-        if job_data:
-            df = pd.DataFrame(job_data) 
-            message = f"Jobs ({len(job_data)}) data successfully scraped."
+        def run():
+            try:
+                scraper.run(queries)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                pending.put(finished)
+
+        threading.Thread(target=run, name="job-scraper", daemon=True).start()
+
+        shown = len(rows)
+        last_push = time.monotonic()
+        while True:
+            try:
+                item = pending.get(timeout=max(0.0, last_push + STREAM_BATCH_SECONDS - time.monotonic()))
+            except queue.Empty:
+                item = None
+            if item is finished:
+                break
+            if item is not None and job_key(item.link) not in seen:
+                seen.add(job_key(item.link))
+                new_keys.append(job_key(item.link))
+                rows.append(job_row(item))
+
+            due = time.monotonic() - last_push >= STREAM_BATCH_SECONDS
+            if len(rows) - shown >= STREAM_BATCH_ROWS or (due and len(rows) > shown):
+                add_recommendations(rows[shown:])
+                shown = len(rows)
+                last_push = time.monotonic()
+                yield {"headers": COLUMNS, "data": rows}, f"Scraping... {shown} jobs found so far." + error_note(scrape_errors)
+            elif due:
+                last_push = time.monotonic()
+
+        add_recommendations(rows[shown:])
+        if errors:
+            raise errors[0]
+
+        # Partial scrapes (LinkedIn blocks, timeouts) must not be served as fresh results or move the watermark.
+        # A new search that found nothing is not cached either, but a clean refresh with nothing new still
+        # moves the watermark, so the search is served from the cache again until its TTL runs out
+        if scrape_errors:
+            logging.warning(f"Not caching search {key!r}: {len(scrape_errors)} scraping error(s).")
+        elif new_keys or cached is not None:
+            job_store.save_search(key, query, location_list, time_filter, new_keys, rows[cached_count:], started_at)
+
+        if cached is not None:
+            message = f"Jobs ({len(rows)}) data successfully scraped, {len(rows) - cached_count} new since the last search."
+            logging.info(message)
+            yield (pd.DataFrame(rows, columns=COLUMNS) if rows else pd.DataFrame()), message + error_note(scrape_errors)
+        elif rows:
+            message = f"Jobs ({len(rows)}) data successfully scraped."
             logging.info(message)
-            return df, message
+            yield pd.DataFrame(rows, columns=COLUMNS), message + error_note(scrape_errors)
         else:
             logging.warning("No job data found.")
-            return pd.DataFrame(), 'No jobs found.'
+            yield pd.DataFrame(), 'No jobs found.' + error_note(scrape_errors)
 
     except Exception as e:
         # Handle specific exceptions and log detailed information
         logging.error(f"An error occurred during scraping: {e}", exc_info=True)
         message = f"An error occurred during scraping: {e}. Please check the logs for more details."
-        return None, message
+        # Keep whatever was streamed before the failure on screen
+        yield (pd.DataFrame(rows, columns=COLUMNS) if rows else None), message
 
 def gradio_interface(query, locations, time_filter):
-    df, message = scrape_jobs(query, locations, time_filter)
-    return df, message
+    yield from scrape_jobs(query, locations, time_filter)
 
 # App Layout
 iface = gr.Interface(
@@ -105,12 +250,14 @@ iface = gr.Interface(
             ),
     ],
     outputs=[
-        gr.Dataframe(label="Job Results", headers=['Date','Company', 'ApplyLink'], interactive=True),
+        gr.Dataframe(label="Job Results", headers=COLUMNS, interactive=True),
         gr.Textbox(label="Message"),
     ],
     title="Job Scraper",
     description="Enter a job query and locations to scrape job postings and display the results in a table.",
 )
 
+iface.queue(default_concurrency_limit=CONCURRENCY_LIMIT)
+
 if __name__ == "__main__":
     iface.launch()
@@ -0,0 +1,171 @@
+import logging
+import threading
+import time
+
+import psutil
+from linkedin_jobs_scraper import linkedin_scraper
+from linkedin_jobs_scraper.utils.chrome_driver import build_driver
+
+
+class PooledDriver:
+    """Driver handed to the scraper in place of a fresh Chrome.
+
+    The scraper calls close() after each location and quit() when a query ends; both
+    hand the browser back to the pool instead of ending it. Everything else is
+    forwarded to the real driver.
+    """
+
+    def __init__(self, pool, driver):
+        self._pool = pool
+        self._driver = driver
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            self._pool.release(self._driver)
+
+    def quit(self):
+        self.close()
+
+
+class BrowserPool:
+    """Long-lived pool of warm headless Chrome sessions shared by all scraping requests.
+
+    At most `max_browsers` browsers exist at once on this host; callers wait for a free
+    one. A browser is health-checked when leased and recycled after `max_leases` leases
+    (one per scraped location, however many pages that loads) or once its process tree
+    uses more than `max_memory_mb`.
+    """
+
+    def __init__(self, max_browsers=5, max_leases=50, max_memory_mb=1024, acquire_timeout=300, page_load_timeout=100):
+        self.max_browsers = max_browsers
+        self.max_leases = max_leases
+        self.max_memory_mb = max_memory_mb
+        self.acquire_timeout = acquire_timeout
+        self.page_load_timeout = page_load_timeout
+        self._idle = []
+        self._leases = {}
+        self._total = 0
+        self._condition = threading.Condition()
+
+    def install(self):
+        """Makes every LinkedinScraper lease drivers from this pool instead of launching new ones."""
+        def leased_driver(executable_path=None, binary_location=None, options=None, headless=True, timeout=20):
+            return PooledDriver(self, self.acquire())
+
+        linkedin_scraper.build_driver = leased_driver
+
+    def prewarm(self, count=None):
+        """Starts browsers in the background so the first requests do not pay for Chrome startup."""
+        def warm():
+            drivers = []
+            for _ in range(count or self.max_browsers):
+                try:
+                    drivers.append(self.acquire(timeout=0))
+                except Exception as e:
+                    logging.warning(f"Could not prewarm browser: {e}")
+                    break
+            for driver in drivers:
+                self.release(driver, count_lease=False)
+
+        threading.Thread(target=warm, name="browser-pool-prewarm", daemon=True).start()
+
+    def acquire(self, timeout=None):
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._condition:
+                while not self._idle and self._total >= self.max_browsers:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No browser became free within {timeout}s ({self.max_browsers} in use)")
+                    self._condition.wait(remaining)
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    driver = None
+                    self._total += 1
+
+            if driver is None:
+                try:
+                    driver = build_driver(headless=True, timeout=self.page_load_timeout)
+                except Exception:
+                    self._forget(None)
+                    raise
+                self._leases[id(driver)] = 0
+                logging.info(f"[BROWSER_POOL] Started browser ({self._total}/{self.max_browsers})")
+                return driver
+            if self._healthy(driver):
+                return driver
+            self._discard(driver, "failed health check")
+
+    def release(self, driver, count_lease=True):
+        if count_lease:
+            self._leases[id(driver)] = self._leases.get(id(driver), 0) + 1
+        if self._leases.get(id(driver), 0) >= self.max_leases:
+            self._discard(driver, f"served {self.max_leases} leases")
+            return
+        memory_mb = self._memory_mb(driver)
+        if memory_mb > self.max_memory_mb:
+            self._discard(driver, f"using {memory_mb:.0f} MB")
+            return
+        try:
+            # Tabs or windows the last lease opened must not leak into the next one
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.get("about:blank")
+        except Exception:
+            self._discard(driver, "failed to reset")
+            return
+        with self._condition:
+            self._idle.append(driver)
+            self._condition.notify()
+
+    def shutdown(self):
+        with self._condition:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver, "pool shutdown")
+
+    def stats(self):
+        with self._condition:
+            return {"browsers": self._total, "idle": len(self._idle), "max_browsers": self.max_browsers}
+
+    @staticmethod
+    def _healthy(driver):
+        try:
+            return driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def _memory_mb(driver):
+        """Resident memory of chromedriver and every Chrome process it started."""
+        try:
+            root = psutil.Process(driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            return sum(process.memory_info().rss for process in processes) / (1024 * 1024)
+        except Exception:
+            return 0.0
+
+    def _discard(self, driver, reason):
+        logging.info(f"[BROWSER_POOL] Recycling browser: {reason}")
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        self._forget(driver)
+
+    def _forget(self, driver):
+        if driver is not None:
+            self._leases.pop(id(driver), None)
+        with self._condition:
+            self._total -= 1
+            self._condition.notify()
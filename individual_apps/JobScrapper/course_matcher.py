@@ -0,0 +1,129 @@
+import json
+import logging
+import math
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+from scipy import sparse
+
+COURSES_PATH = os.getenv(
+    "JOBSCRAPPER_COURSES_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Smart-Course-Search", "courses.json"),
+)
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or our the this to using we with you your "
+    "free course courses lesson lessons description nano program certified comprehensive path become "
+    "getting started introduction first way".split()
+)
+# Spelled-out forms, so "ML" in a posting and "Machine Learning" in a course title share terms
+ALIASES = {
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "genai": "generative artificial intelligence",
+    "llm": "large language model",
+    "nlp": "natural language processing",
+    "rag": "retrieval augmented generation",
+    "rl": "reinforcement learning",
+}
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9+#]*")
+
+
+@lru_cache(maxsize=65536)
+def normalize_token(token):
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        token = token[:-1]
+    return tuple(word for word in ALIASES.get(token, token).split() if word not in STOP_WORDS)
+
+
+def tokenize(text):
+    return [word for token in TOKEN_PATTERN.findall(text.lower()) for word in normalize_token(token)]
+
+
+def terms(text, vocabulary=None):
+    """Unigrams plus adjacent bigrams, so multi-word skills like "deep learning" count as one term too.
+
+    With a vocabulary, terms outside it are dropped before any bigram strings are built.
+    """
+    tokens = tokenize(text)
+    if vocabulary is None:
+        return tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+    known = [token in vocabulary for token in tokens]
+    bigrams = [
+        f"{tokens[i]} {tokens[i + 1]}" for i in range(len(tokens) - 1) if known[i] and known[i + 1]
+    ]
+    return [token for token, is_known in zip(tokens, known) if is_known] + bigrams
+
+
+class CourseMatcher:
+    """Recommends courses for job postings from a TF-IDF index, without any network calls.
+
+    The vocabulary and IDF weights are fitted on course text, so the course matrix is built
+    once and is read-only afterwards. Each batch of job descriptions is vectorized against
+    it as the batch arrives; its top-k courses come from a single sparse product and an
+    argpartition over the rows. Nothing is kept per job, so memory does not grow with the
+    number of postings scraped.
+    """
+
+    def __init__(self, courses, top_k=3, min_score=0.05):
+        self.courses = courses
+        self.top_k = top_k
+        self.min_score = min_score
+
+        course_terms = [Counter(terms(f"{course['title']} {course.get('description', '')}")) for course in courses]
+        document_frequency = Counter(term for counts in course_terms for term in counts)
+        self.vocabulary = {term: i for i, term in enumerate(sorted(document_frequency))}
+        self.idf = np.array(
+            [math.log((1 + len(courses)) / (1 + document_frequency[term])) + 1 for term in sorted(document_frequency)]
+        )
+        # Stored transposed so job rows multiply straight into (jobs x courses) scores
+        self._courses_t = self._vectorize(course_terms).T.tocsr()
+
+    @classmethod
+    def from_file(cls, path=COURSES_PATH, **kwargs):
+        """Loads courses.json, or returns None (recommendations off) when it is not available."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                courses = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Course recommendations disabled, could not load {path}: {e}")
+            return None
+        return cls(courses, **kwargs)
+
+    def _vectorize(self, term_counts):
+        """L2-normalized sublinear TF-IDF rows over the course vocabulary; unknown terms are ignored."""
+        indptr, indices, data = [0], [], []
+        for counts in term_counts:
+            for term, count in counts.items():
+                column = self.vocabulary.get(term)
+                if column is not None:
+                    indices.append(column)
+                    data.append((1 + math.log(count)) * self.idf[column])
+            indptr.append(len(indices))
+        matrix = sparse.csr_matrix(
+            (np.array(data, dtype=float), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int32)),
+            shape=(len(term_counts), len(self.vocabulary)),
+        )
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1 / norms) @ matrix
+
+    def recommend(self, descriptions, top_k=None):
+        """Top-k (course, score) pairs per job description, best first, skipping weak matches."""
+        top_k = min(top_k or self.top_k, len(self.courses))
+        if not descriptions or top_k == 0:
+            return [[] for _ in descriptions]
+        jobs = self._vectorize([Counter(terms(description or "", self.vocabulary)) for description in descriptions])
+        scores = (jobs @ self._courses_t).toarray()
+        best = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        order = np.argsort(-best_scores, axis=1)
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        return [
+            [(self.courses[i], float(score)) for i, score in zip(row, row_scores) if score >= self.min_score]
+            for row, row_scores in zip(best, best_scores)
+        ]
@@ -0,0 +1,119 @@
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+JOBSCRAPPER_DB = os.getenv("JOBSCRAPPER_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "jobs.db"))
+
+# Postings are stored once per link (without tracking parameters). A search only
+# records which postings it returned and when it last scraped LinkedIn, its watermark.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_key TEXT PRIMARY KEY,
+    link TEXT NOT NULL,
+    date_posted TEXT,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    description TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS searches (
+    search_key TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    locations TEXT NOT NULL,
+    time_filter TEXT NOT NULL,
+    scraped_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS search_jobs (
+    search_key TEXT NOT NULL REFERENCES searches (search_key),
+    job_key TEXT NOT NULL REFERENCES jobs (job_key),
+    PRIMARY KEY (search_key, job_key)
+);
+"""
+
+
+def search_key(query, locations, time_filter):
+    """Same search regardless of case, spacing or the order locations were typed in."""
+    normalized_locations = sorted({location.strip().lower() for location in locations if location.strip()})
+    return "|".join([" ".join(query.lower().split()), ",".join(normalized_locations), time_filter])
+
+
+class JobStore:
+    """SQLite store of scraped postings, deduplicated by link, and of the searches that found them."""
+
+    def __init__(self, db_path=JOBSCRAPPER_DB):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_search(self, key, max_age=None):
+        """Returns {"scraped_at", "rows"} for a previously run search, or None.
+
+        Rows are lists in the app's column order. Postings first seen more than `max_age`
+        seconds ago are left out, since they have aged out of the search's time filter.
+        """
+        cutoff = time.time() - max_age if max_age else 0.0
+        with self._connect() as conn:
+            search = conn.execute("SELECT scraped_at FROM searches WHERE search_key = ?", (key,)).fetchone()
+            if search is None:
+                return None
+            jobs = conn.execute(
+                """
+                SELECT j.* FROM search_jobs s JOIN jobs j ON j.job_key = s.job_key
+                WHERE s.search_key = ? AND j.first_seen >= ?
+                ORDER BY s.rowid
+                """,
+                (key, cutoff),
+            ).fetchall()
+        rows = [
+            [job["date_posted"], job["title"], job["company"], job["location"], job["link"], len(job["description"]), job["description"]]
+            for job in jobs
+        ]
+        return {"scraped_at": search["scraped_at"], "rows": rows}
+
+    def save_search(self, key, query, locations, time_filter, job_keys, rows, scraped_at):
+        """Adds newly scraped postings to a search and moves its watermark to `scraped_at`.
+
+        `job_keys` are the dedup keys of `rows`, and may be empty when a refresh found nothing
+        new. Postings already stored by another search are only linked and marked as seen,
+        not rewritten.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO searches (search_key, query, locations, time_filter, scraped_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (search_key) DO UPDATE SET scraped_at = MAX(scraped_at, excluded.scraped_at)
+                """,
+                (key, query, ", ".join(locations), time_filter, scraped_at),
+            )
+            conn.executemany(
+                """
+                INSERT INTO jobs (job_key, link, date_posted, title, company, location, description, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (job_key) DO UPDATE SET last_seen = excluded.last_seen
+                """,
+                [
+                    (job_key, link, date_posted, title, company, location, description, now, now)
+                    for job_key, (date_posted, title, company, location, link, _, description, *_) in zip(job_keys, rows)
+                ],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO search_jobs (search_key, job_key) VALUES (?, ?)",
+                [(key, job_key) for job_key in job_keys],
+            )
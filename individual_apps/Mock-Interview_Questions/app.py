@@ -1,65 +1,309 @@
 import streamlit as st
 from langchain_google_genai import ChatGoogleGenerativeAI
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+import json
+import logging
 import re
+from roles import ROLES_AND_TOPICS, DIFFICULTY_LEVELS
+from question_bank import QuestionBank, make_llm_generator
+from results_store import ResultsStore
+from llm_backend import LLM_BACKEND, FakeLLM
 
-def generate_question(role, topic, difficulty_level):
-    prompt = f"Generate an interview question for the role of {role} on the topic of {topic} with difficulty level {difficulty_level}."
-    llm = ChatGoogleGenerativeAI(model="gemini-pro", google_api_key=st.secrets["GOOGLE_API_KEY"])
-    response = llm.invoke(prompt)
-    response = response.content
- 
-    return response
+# Upper bound on concurrent Gemini requests shared by all sessions of this process
+MAX_PARALLEL_REQUESTS = 5
+# Separate workers for questions a candidate is waiting on, so they never queue behind other sessions' background work
+MAX_PARALLEL_URGENT_REQUESTS = 2
+# Generation attempts per question before the candidate is asked to retry
+MAX_QUESTION_ATTEMPTS = 3
 
-def evaluate_answer(question, user_answer):
-    prompt = f"Question: {question}\nUser's Answer: {user_answer}\nEvaluate the answer and provide feedback. Also, provide the best possible answer."
-    llm = ChatGoogleGenerativeAI(model="gemini-pro", google_api_key=st.secrets["GOOGLE_API_KEY"])
-    response = llm.invoke(prompt)
-    response = response.content
- 
-    return response
+PER_QUESTION_EVALUATION = "After each answer"
+BATCHED_EVALUATION = "All at once at the end"
+# Questions plus answers per batched grading call, in characters, kept well inside gemini-pro's context window
+EVALUATION_BATCH_CHAR_BUDGET = 12000
+
+@st.cache_resource
+def get_llm():
+    if LLM_BACKEND == "fake":
+        return FakeLLM()
+    return ChatGoogleGenerativeAI(model="gemini-pro", google_api_key=st.secrets["GOOGLE_API_KEY"])
+
+@st.cache_resource
+def get_executor():
+    return ThreadPoolExecutor(max_workers=MAX_PARALLEL_REQUESTS, thread_name_prefix="mock-interview-llm")
 
-# ----------------------
-def generate_question(role, topic, difficulty_level):
-    prompt = f"Generate an interview question for the role of {role} on the topic of {topic} with difficulty level {difficulty_level}."
-    llm = ChatGoogleGenerativeAI(model="gemini-pro", google_api_key=st.secrets["GOOGLE_API_KEY"])
+@st.cache_resource
+def get_urgent_executor():
+    return ThreadPoolExecutor(max_workers=MAX_PARALLEL_URGENT_REQUESTS, thread_name_prefix="mock-interview-llm-urgent")
+
+@st.cache_resource
+def get_question_bank():
+    return QuestionBank(generate=make_llm_generator(get_llm()))
+
+@st.cache_resource
+def get_results_store():
+    return ResultsStore()
+
+def generate_question(llm, role, topic, difficulty_level, index=1, total=1):
+    # Runs on the executor, so it must not touch st.* - the client is passed in by the caller
+    prompt = (
+        f"Generate an interview question for the role of {role} on the topic of {topic} with difficulty level {difficulty_level}. "
+        f"This is question {index} of {total} in the interview, so make it distinct from a generic opener."
+    )
     response = llm.invoke(prompt)
     response = response.content
  
     return response
 
-def evaluate_answer(question, user_answer):
+def submit_question(role, topic, difficulty_level, index, total, urgent=False):
+    executor = get_urgent_executor() if urgent else get_executor()
+    return executor.submit(generate_question, get_llm(), role, topic, difficulty_level, index + 1, total)
+
+def start_question_generation(role, topic, difficulty_level, total, start=0):
+    """Submits generations for questions `start`..`total - 1` at once and returns their futures in interview order.
+
+    The first question is the one the candidate waits on, so it gets an urgent worker.
+    """
+    return [
+        submit_question(role, topic, difficulty_level, i, total, urgent=(i == 0))
+        for i in range(start, total)
+    ]
+
+def start_interview_questions(role, topic, difficulty_level, total):
+    """Serves the interview from the question bank and only generates live for what the pool cannot cover."""
+    pooled = get_question_bank().draw(role, topic, difficulty_level, total)
+    futures = start_question_generation(role, topic, difficulty_level, total, start=len(pooled)) if len(pooled) < total else []
+    st.session_state['interview_settings'] = (role, topic, difficulty_level)
+    st.session_state['questions'] = pooled + [None] * len(futures)
+    st.session_state['question_futures'] = [None] * len(pooled) + futures
+    st.session_state['question_attempts'] = [0] * len(pooled) + [1] * len(futures)
+
+def replace_failed_question(index, urgent=False):
+    """Fills a question whose generation failed from the bank, or generates it again while attempts remain."""
+    role, topic, difficulty_level = st.session_state['interview_settings']
+    questions = st.session_state['questions']
+    futures = st.session_state['question_futures']
+    futures[index] = None
+    pooled = get_question_bank().draw(role, topic, difficulty_level, 1, exclude=questions)
+    if pooled:
+        questions[index] = pooled[0]
+    elif st.session_state['question_attempts'][index] < MAX_QUESTION_ATTEMPTS:
+        st.session_state['question_attempts'][index] += 1
+        futures[index] = submit_question(role, topic, difficulty_level, index, len(questions), urgent=urgent)
+
+def resolve_question(index, urgent=False):
+    """Moves a finished (or, when waited on, pending) generation into session state."""
+    try:
+        st.session_state['questions'][index] = st.session_state['question_futures'][index].result()
+        st.session_state['question_futures'][index] = None
+    except Exception as e:
+        logging.error(f"Error generating question {index + 1}: {e}", exc_info=True)
+        replace_failed_question(index, urgent=urgent)
+
+def collect_ready_questions():
+    """Moves finished background questions into session state without blocking."""
+    futures = st.session_state['question_futures']
+    for i, future in enumerate(futures):
+        if st.session_state['questions'][i] is None and future is not None and future.done():
+            resolve_question(i)
+
+def get_question(index):
+    """Returns question `index`, waiting only if its generation is still in flight.
+
+    Returns None once every attempt has failed and the bank has nothing to stand in for it.
+    """
+    while st.session_state['questions'][index] is None and st.session_state['question_futures'][index] is not None:
+        resolve_question(index, urgent=True)
+    return st.session_state['questions'][index]
+
+def retry_question(index):
+    st.session_state['question_attempts'][index] = 0
+    replace_failed_question(index, urgent=True)
+
+def evaluate_answer(llm, question, user_answer):
+    # Runs on the executor like generate_question, so the client is passed in
     prompt = f"Question: {question}\nUser's Answer: {user_answer}\nEvaluate the answer, give a score out of 100, and provide feedback. Also, provide the best possible answer."
-    llm = ChatGoogleGenerativeAI(model="gemini-pro", google_api_key=st.secrets["GOOGLE_API_KEY"])
     response = llm.invoke(prompt)
    
     evaluation = response.content
     # Extract score and feedback from the evaluation
      # Extract score using regular expressions
     score_match = re.search(r'(\d+)/100', evaluation)
-    score = int(score_match.group(1)) if score_match else 0
+    # No score in the reply means the evaluation failed, not that the answer earned 0
+    score = int(score_match.group(1)) if score_match else None
 
     # Extract feedback
     feedback = evaluation.split('\n', 1)[1] if '\n' in evaluation else evaluation
     return score, feedback
 
+def build_batch_evaluation_prompt(items):
+    parts = [f"Item {index + 1}\nQuestion: {question}\nUser's Answer: {answer}" for index, question, answer in items]
+    return (
+        "Evaluate each of the following interview answers, give each a score out of 100, and provide feedback. "
+        "Also, provide the best possible answer as part of the feedback.\n"
+        'Reply with only a JSON array containing one object per item: {"item": <item number>, "score": <0-100>, "feedback": "<feedback>"}.\n\n'
+        + "\n\n".join(parts)
+    )
+
+def parse_batch_evaluation(text, items):
+    """Returns {index: (score, feedback)} for every well-formed entry of a batched grading reply."""
+    wanted = {index + 1: index for index, _, _ in items}
+    match = re.search(r"\[.*\]", text, re.DOTALL)
+    if not match:
+        return {}
+    try:
+        entries = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return {}
+    results = {}
+    for entry in entries if isinstance(entries, list) else []:
+        try:
+            item, score, feedback = int(entry["item"]), int(entry["score"]), str(entry["feedback"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if item in wanted:
+            results[wanted[item]] = (max(0, min(100, score)), feedback)
+    return results
+
+def chunk_evaluation_items(items, budget=EVALUATION_BATCH_CHAR_BUDGET):
+    chunk, size = [], 0
+    for item in items:
+        item_size = len(item[1]) + len(item[2])
+        if chunk and size + item_size > budget:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(item)
+        size += item_size
+    if chunk:
+        yield chunk
+
+def chain_future(source, target):
+    """Resolves `target` with the result or exception of `source` once it finishes."""
+    def copy(done):
+        if done.exception() is not None:
+            target.set_exception(done.exception())
+        else:
+            target.set_result(done.result())
+    source.add_done_callback(copy)
+
+def evaluate_batch(llm, items, futures, executor):
+    """Grades a chunk of (index, question, answer) in one call and resolves each question's future.
+
+    Items missing from a malformed reply fall back to one evaluate_answer call each, submitted
+    to `executor` so they run in parallel rather than one after another in this task.
+    """
+    try:
+        results = parse_batch_evaluation(llm.invoke(build_batch_evaluation_prompt(items)).content, items)
+    except Exception as e:
+        logging.error(f"Error during batched evaluation: {e}", exc_info=True)
+        results = {}
+    for index, question, answer in items:
+        if index in results:
+            futures[index].set_result(results[index])
+        else:
+            try:
+                chain_future(executor.submit(evaluate_answer, llm, question, answer), futures[index])
+            except Exception as e:
+                futures[index].set_exception(e)
+
+def submit_batched_evaluations():
+    """Grades the whole interview in as few calls as fit the context budget, one executor task per chunk."""
+    items = [(i, st.session_state['questions'][i], st.session_state['answers'][i]) for i in range(st.session_state['total_questions'])]
+    llm = get_llm()
+    executor = get_executor()
+    for chunk in chunk_evaluation_items(items):
+        futures = {index: Future() for index, _, _ in chunk}
+        for index, future in futures.items():
+            st.session_state['evaluation_futures'][index] = future
+        executor.submit(evaluate_batch, llm, chunk, futures, executor)
+    st.session_state['batch_evaluation_submitted'] = True
+
+def submit_evaluation(index, answer):
+    """Queues the evaluation of answer `index` so the candidate can move on while Gemini grades it."""
+    question = st.session_state['questions'][index]
+    st.session_state['evaluation_futures'][index] = get_executor().submit(evaluate_answer, get_llm(), question, answer)
+
+def collect_evaluation(index):
+    future = st.session_state['evaluation_futures'][index]
+    try:
+        score, feedback = future.result()
+    except Exception as e:
+        score, feedback = None, f"Evaluation failed: {e}"
+    st.session_state['scores'][index] = score
+    st.session_state['feedback'][index] = feedback
+    st.session_state['evaluation_futures'][index] = None
+
+def write_evaluation(index):
+    score = st.session_state['scores'][index]
+    st.write(f"**Score:** {score if score is not None else 'not available'}")
+    st.write(f"**Feedback:** {st.session_state['feedback'][index]}")
+
+def record_results():
+    """Saves the finished interview once, so it shows up on the hub's Progress Monitoring page.
+
+    Answers whose evaluation failed are stored as missing rather than as a score of 0.
+    """
+    role, topic, difficulty_level = st.session_state['interview_settings']
+    get_results_store().record_interview(
+        st.session_state['candidate_name'], role, topic, difficulty_level, st.session_state['scores']
+    )
+    st.session_state['results_recorded'] = True
+
 def generate_report():
     st.write("### Interview Report")
-    for i in range(st.session_state['total_questions']):
+    futures = st.session_state['evaluation_futures']
+    # Take whatever already finished in the background; only the stragglers are waited on below
+    for i, future in enumerate(futures):
+        if future is not None and future.done():
+            collect_evaluation(i)
+    outstanding = {future: i for i, future in enumerate(futures) if future is not None}
+    total = st.session_state['total_questions']
+    status = st.empty()
+    status.write(f"{total - len(outstanding)} of {total} answers evaluated.")
+
+    placeholders = {}
+    for i in range(total):
         st.write(f"**Question {i+1}:** {st.session_state['questions'][i]}")
         st.write(f"**Your Answer:** {st.session_state['answers'][i]}")
-        st.write(f"**Score:** {st.session_state['scores'][i]}")
-        st.write(f"**Feedback:** {st.session_state['feedback'][i]}")
+        placeholders[i] = st.empty()
+        if futures[i] is None:
+            with placeholders[i].container():
+                write_evaluation(i)
+        else:
+            placeholders[i].info("Evaluation in progress...")
         st.write("---")
 
+    for done, future in enumerate(as_completed(outstanding), start=total - len(outstanding) + 1):
+        i = outstanding[future]
+        collect_evaluation(i)
+        with placeholders[i].container():
+            write_evaluation(i)
+        status.write(f"{done} of {total} answers evaluated.")
+
 # Initialize session state
 if 'questions' not in st.session_state:
     st.session_state['questions'] = []
+if 'question_futures' not in st.session_state:
+    st.session_state['question_futures'] = []
 if 'answers' not in st.session_state:
     st.session_state['answers'] = []
 if 'feedback' not in st.session_state:
     st.session_state['feedback'] = []
 if 'scores' not in st.session_state:
     st.session_state['scores'] = []
+if 'evaluation_futures' not in st.session_state:
+    st.session_state['evaluation_futures'] = []
+if 'evaluation_mode' not in st.session_state:
+    st.session_state['evaluation_mode'] = PER_QUESTION_EVALUATION
+if 'batch_evaluation_submitted' not in st.session_state:
+    st.session_state['batch_evaluation_submitted'] = False
+if 'candidate_name' not in st.session_state:
+    st.session_state['candidate_name'] = "guest"
+if 'question_attempts' not in st.session_state:
+    st.session_state['question_attempts'] = []
+if 'interview_settings' not in st.session_state:
+    st.session_state['interview_settings'] = None
+if 'results_recorded' not in st.session_state:
+    st.session_state['results_recorded'] = False
 if 'current_question' not in st.session_state:
     st.session_state['current_question'] = 0
 if 'total_questions' not in st.session_state:
@@ -72,43 +316,26 @@ if 'interview_started' not in st.session_state:
 st.title("Mock Interview Bot")
 
 if not st.session_state['interview_started']:
-    roles_and_topics = {      
-  
-    "Front-End Developer": ["HTML/CSS", "JavaScript and Frameworks (React, Angular, Vue.js)", "Responsive Design", "Browser Compatibility"],
-    "Back-End Developer": ["Server-Side Languages (Node.js, Python, Ruby, PHP)", "Database Management (SQL, NoSQL)", "API Development", "Server and Hosting Management"],
-    "Full-Stack Developer": ["Combination of Front-End and Back-End Topics", "Integration of Systems", "DevOps Basics"],
-    "Mobile Developer": ["Android Development (Java, Kotlin)", "iOS Development (Swift, Objective-C)", "Cross-Platform Development (Flutter, React Native)"],
-    "Data Scientist": ["Statistical Analysis", "Machine Learning Algorithms", "Data Wrangling and Cleaning", "Data Visualization"],
-    "Data Analyst": ["Data Collection and Processing", "SQL and Database Querying", "Data Visualization Tools (Tableau, Power BI)", "Basic Statistics"],
-    "Machine Learning Engineer": ["Supervised and Unsupervised Learning", "Model Deployment", "Deep Learning", "Natural Language Processing"],
-    "DevOps Engineer": ["Continuous Integration/Continuous Deployment (CI/CD)", "Containerization (Docker, Kubernetes)", "Infrastructure as Code (Terraform, Ansible)", "Cloud Platforms (AWS, Azure, Google Cloud)"],
-    "Cloud Engineer": ["Cloud Architecture", "Cloud Services (Compute, Storage, Networking)", "Security in the Cloud", "Cost Management"],
-    "Cybersecurity Analyst": ["Threat Detection and Mitigation", "Security Protocols and Encryption", "Network Security", "Incident Response"],
-    "Penetration Tester": ["Vulnerability Assessment", "Ethical Hacking Techniques", "Security Tools (Metasploit, Burp Suite)", "Report Writing and Documentation"],
-    "Project Manager": ["Project Planning and Scheduling", "Risk Management", "Agile and Scrum Methodologies", "Stakeholder Communication"],
-    "UX/UI Designer": ["User Research", "Wireframing and Prototyping", "Design Principles", "Usability Testing"],
-    "Quality Assurance (QA) Engineer": ["Testing Methodologies", "Automation Testing", "Bug Tracking", "Performance Testing"],
-    "Blockchain Developer": ["Blockchain Fundamentals", "Smart Contracts", "Cryptographic Algorithms", "Decentralized Applications (DApps)"],
-    "Digital Marketing Specialist": ["SEO/SEM", "Social Media Marketing", "Content Marketing", "Analytics and Reporting"],
-    "AI Research Scientist": ["AI Theory", "Algorithm Development", "Neural Networks", "Natural Language Processing"],
-    "AI Engineer": ["AI Model Deployment", "Machine Learning Engineering", "Deep Learning", "AI Tools and Frameworks"],
-    "Generative AI Specialist (GenAI)": ["Generative Models", "GANs (Generative Adversarial Networks)", "Creative AI Applications", "Ethics in AI"],
-    "Generative Business Intelligence Specialist (GenBI)": ["Automated Data Analysis", "Business Intelligence Tools", "Predictive Analytics", "AI in Business Strategy"]
-
-
-    }
-
-
-
-
-    
-    role = st.selectbox('Select Role', list(roles_and_topics.keys()))
-    topic = st.selectbox('Select Topic', roles_and_topics[role])
-    difficulty_level = st.selectbox("Select difficulty level:", ["Easy", "Medium", "Hard"])
+    candidate_name = st.text_input("Your username (used for progress tracking)", value=st.session_state['candidate_name'])
+    role = st.selectbox('Select Role', list(ROLES_AND_TOPICS.keys()))
+    topic = st.selectbox('Select Topic', ROLES_AND_TOPICS[role])
+    difficulty_level = st.selectbox("Select difficulty level:", DIFFICULTY_LEVELS)
+    evaluation_mode = st.radio("Evaluate answers:", [PER_QUESTION_EVALUATION, BATCHED_EVALUATION])
 
     if st.button("Start Interview"):
         if role and topic and difficulty_level:
-            st.session_state['questions'] = [generate_question(role, topic, difficulty_level) for _ in range(st.session_state['total_questions'])]
+            start_interview_questions(role, topic, difficulty_level, st.session_state['total_questions'])
+            # Only the first question is awaited; anything not served from the bank keeps generating in the background
+            with st.spinner("Preparing your first question..."):
+                get_question(0)
+            total = st.session_state['total_questions']
+            st.session_state['scores'] = [None] * total
+            st.session_state['feedback'] = [None] * total
+            st.session_state['evaluation_futures'] = [None] * total
+            st.session_state['evaluation_mode'] = evaluation_mode
+            st.session_state['batch_evaluation_submitted'] = False
+            st.session_state['candidate_name'] = candidate_name.strip() or "guest"
+            st.session_state['results_recorded'] = False
             st.session_state['current_question'] = 0
             st.session_state['interview_started'] = True
             st.session_state['question_answered'] = False
@@ -116,19 +343,27 @@ if not st.session_state['interview_started']:
 if st.session_state['interview_started']:
     current_question = st.session_state['current_question']
     if current_question < st.session_state['total_questions']:
-        st.write(f"Question {current_question + 1}: {st.session_state['questions'][current_question]}")
+        collect_ready_questions()
+        question = get_question(current_question)
+        if question is None:
+            st.error("This question could not be generated. Please try again.")
+            if st.button("Retry Question"):
+                retry_question(current_question)
+                st.rerun()
+            st.stop()
+        st.write(f"Question {current_question + 1}: {question}")
         
         if not st.session_state['question_answered']:
             answer = st.text_area("Your Answer:", key=f"answer_{current_question}")
             if st.button("Submit Answer"):
                 if answer:
                     st.session_state['answers'].append(answer)
-                    score, feedback = evaluate_answer(st.session_state['questions'][current_question], answer)
-                    st.session_state['scores'].append(score)
-                    st.session_state['feedback'].append(feedback)
                     st.session_state['question_answered'] = True
-                    st.write(f"Score: {score}")
-                    st.write(f"Feedback: {feedback}")
+                    if st.session_state['evaluation_mode'] == PER_QUESTION_EVALUATION:
+                        submit_evaluation(current_question, answer)
+                        st.write("Answer submitted. It is being evaluated in the background and the result will be in your report.")
+                    else:
+                        st.write("Answer submitted. All answers will be evaluated together at the end of the interview.")
         
         if st.session_state['question_answered']:
             if st.button("Next Question"):
@@ -136,4 +371,8 @@ if st.session_state['interview_started']:
                 st.session_state['question_answered'] = False
     else:
         st.write("Interview Complete! Generating Report...")
+        if st.session_state['evaluation_mode'] == BATCHED_EVALUATION and not st.session_state['batch_evaluation_submitted']:
+            submit_batched_evaluations()
         generate_report()
+        if not st.session_state['results_recorded']:
+            record_results()
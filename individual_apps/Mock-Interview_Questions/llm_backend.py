@@ -0,0 +1,52 @@
+import json
+import os
+import random
+import re
+import time
+
+# "gemini" talks to Google; "fake" answers locally so the app can be load tested offline
+LLM_BACKEND = os.getenv("MOCK_INTERVIEW_LLM", "gemini")
+FAKE_LLM_LATENCY = float(os.getenv("FAKE_LLM_LATENCY", "1.0"))
+FAKE_LLM_JITTER = float(os.getenv("FAKE_LLM_JITTER", "0.2"))
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeLLM:
+    """Offline stand-in for ChatGoogleGenerativeAI.
+
+    Sleeps for `latency` +/- `jitter` seconds per call and returns replies in the shape
+    each prompt of the app expects (single question, JSON question list, graded answer
+    or batched JSON grades), so every code path runs without a network call.
+    """
+
+    def __init__(self, latency=FAKE_LLM_LATENCY, jitter=FAKE_LLM_JITTER):
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        time.sleep(max(0.0, random.uniform(self.latency - self.jitter, self.latency + self.jitter)))
+        return FakeResponse(self._reply(prompt))
+
+    def _reply(self, prompt):
+        batch = re.search(r"Generate (\d+) distinct interview questions", prompt)
+        if batch:
+            return json.dumps([self._question() for _ in range(int(batch.group(1)))])
+        items = re.findall(r"^Item (\d+)$", prompt, re.MULTILINE)
+        if items:
+            return json.dumps([
+                {"item": int(item), "score": random.randint(0, 100), "feedback": "Fake batched feedback."}
+                for item in items
+            ])
+        if "score out of 100" in prompt:
+            return f"Score: {random.randint(0, 100)}/100\nFake feedback for the answer. The best possible answer is left to the reader."
+        return self._question()
+
+    @staticmethod
+    def _question():
+        return f"Fake interview question #{random.getrandbits(32):08x}: how would you approach this problem?"
@@ -0,0 +1,165 @@
+"""Load generator for the Mock Interview app.
+
+Drives complete interviews through Streamlit's app-testing API against the fake LLM
+backend and reports script rerun latency, memory per session and interviews/minute:
+
+    python load_test.py --sessions 50 --concurrency 10 --latency 1.5
+
+All sessions run in this process and share its st.cache_resource objects (LLM client,
+executor, question bank), the same way concurrent browser sessions share one server.
+Script runs themselves are serialized (see drive_interview), so interviews/minute is a
+lower bound for the instance rather than its ceiling.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+RUN_LOCK = threading.Lock()
+SAMPLE_ANSWER = "I would start by clarifying the requirements, then outline the trade-offs and pick the simplest design."
+
+
+def click(app, label):
+    next(button for button in app.button if button.label == label).click()
+
+
+def pending_futures(app, indices, key):
+    futures = app.session_state[key] if key in app.session_state else []
+    return [futures[i] for i in indices if i < len(futures) and futures[i] is not None]
+
+
+def drive_interview(session_id, args, stats):
+    """Plays one candidate through a full interview and returns the finished AppTest.
+
+    AppTest swaps a process-global mock Runtime in and out on every run, so runs are
+    serialized on RUN_LOCK. A real server runs each session's script on its own thread,
+    so before a rerun that would block on background LLM work the driver waits for
+    that work outside the lock and counts the wait towards the rerun's latency.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(APP_PATH, default_timeout=args.timeout)
+
+    def rerun(blocking_on=()):
+        start = time.perf_counter()
+        for future in blocking_on:
+            future.exception()
+        queued = time.perf_counter()
+        with RUN_LOCK:
+            running = time.perf_counter()
+            app.run()
+            finished = time.perf_counter()
+        stats.record((queued - start) + (finished - running), running - queued)
+        if app.exception:
+            raise RuntimeError(f"session {session_id}: {app.exception[0].message}")
+
+    rerun()
+    app.text_input[0].input(f"loadtest-{session_id}")
+    app.radio[0].set_value(args.evaluation_mode)
+    click(app, "Start Interview")
+    rerun()
+
+    total = app.session_state["total_questions"]
+    while app.session_state["current_question"] < total:
+        current = app.session_state["current_question"]
+        if app.session_state["question_answered"]:
+            click(app, "Next Question")
+            rerun(pending_futures(app, [current + 1], "question_futures"))
+            continue
+        areas = [area for area in app.text_area if area.key == f"answer_{current}"]
+        if not areas:
+            # The previous click advanced the question after this page was drawn
+            rerun(pending_futures(app, [current], "question_futures"))
+            continue
+        areas[0].input(SAMPLE_ANSWER)
+        click(app, "Submit Answer")
+        rerun()
+
+    # Final rerun renders the report, which waits for any outstanding evaluations
+    rerun(pending_futures(app, range(total), "evaluation_futures"))
+    return app
+
+
+class RerunStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.queue_waits = []
+
+    def record(self, latency, queue_wait):
+        with self.lock:
+            self.latencies.append(latency)
+            self.queue_waits.append(queue_wait)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20, help="number of interviews to run")
+    parser.add_argument("--concurrency", type=int, default=5, help="interviews in flight at once")
+    parser.add_argument("--latency", type=float, default=1.0, help="fake LLM latency per call, in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2, help="fake LLM latency jitter, in seconds")
+    parser.add_argument("--evaluation-mode", default="After each answer", help="label of the evaluation mode radio option")
+    parser.add_argument("--timeout", type=float, default=300, help="per-rerun timeout, in seconds")
+    args = parser.parse_args()
+
+    # Configure the app before it is first imported by AppTest; the stores go to a throwaway directory
+    workdir = tempfile.mkdtemp(prefix="mock-interview-load-")
+    os.environ["MOCK_INTERVIEW_LLM"] = "fake"
+    os.environ["FAKE_LLM_LATENCY"] = str(args.latency)
+    os.environ["FAKE_LLM_JITTER"] = str(args.jitter)
+    os.environ.setdefault("QUESTION_BANK_DB", os.path.join(workdir, "question_bank.db"))
+    os.environ.setdefault("INTERVIEW_RESULTS_DB", os.path.join(workdir, "interview_results.db"))
+
+    # One untimed run pays for imports and the shared cache_resource objects up front
+    from streamlit.testing.v1 import AppTest
+    start = time.perf_counter()
+    AppTest.from_file(APP_PATH, default_timeout=args.timeout).run()
+    cold_start = time.perf_counter() - start
+
+    stats = RerunStats()
+    failures = []
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [pool.submit(drive_interview, i, args, stats) for i in range(args.sessions)]
+        apps = []
+        for future in futures:
+            try:
+                apps.append(future.result())
+            except Exception as e:
+                failures.append(e)
+    elapsed = time.perf_counter() - start
+
+    # Finished AppTests are still referenced, so the traced growth is what the sessions hold on to
+    per_session = (tracemalloc.get_traced_memory()[0] - baseline) / max(len(apps), 1)
+    tracemalloc.stop()
+
+    print(f"Cold start (first run): {cold_start * 1000:.0f} ms")
+    print(f"Interviews completed:   {len(apps)} / {args.sessions} ({len(failures)} failed)")
+    print(f"Wall time:              {elapsed:.1f} s")
+    print(f"Interviews per minute:  {len(apps) / elapsed * 60:.1f}")
+    if stats.latencies:
+        print(f"Reruns:                 {len(stats.latencies)}")
+        print(f"Rerun latency p50:      {statistics.median(stats.latencies) * 1000:.0f} ms")
+        print(f"Rerun latency p95:      {percentile(stats.latencies, 95) * 1000:.0f} ms")
+        print(f"Rerun latency max:      {max(stats.latencies) * 1000:.0f} ms")
+        print(f"Harness queueing p95:   {percentile(stats.queue_waits, 95) * 1000:.0f} ms (excluded above)")
+    print(f"Memory per session:     {per_session / 1024:.0f} KiB")
+    for failure in failures[:5]:
+        print(f"Failure: {failure!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from queue import Queue
+
+from roles import ROLES_AND_TOPICS, DIFFICULTY_LEVELS
+
+QUESTION_BANK_DB = os.getenv(
+    "QUESTION_BANK_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "question_bank.db")
+)
+
+# A pool is refilled up to TARGET_POOL_SIZE once fewer than LOW_WATERMARK of its
+# questions are still "fresh" (served fewer than MAX_SERVES_PER_QUESTION times)
+TARGET_POOL_SIZE = 40
+LOW_WATERMARK = 20
+MAX_SERVES_PER_QUESTION = 25
+REFILL_BATCH_SIZE = 10
+MAX_REFILL_ATTEMPTS = 5
+
+# Two questions whose word-shingle Jaccard similarity reaches this are treated as the same question
+DUPLICATE_THRESHOLD = 0.6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    role TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    question TEXT NOT NULL,
+    normalized TEXT NOT NULL,
+    times_served INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    UNIQUE (role, topic, difficulty, normalized)
+);
+CREATE INDEX IF NOT EXISTS idx_questions_pool ON questions (role, topic, difficulty, times_served);
+"""
+
+
+def normalize_question(question):
+    """Lowercases and strips punctuation/numbering so trivially different phrasings compare equal."""
+    question = re.sub(r"^\s*(\d+[.)]|[-*])\s*", "", question.strip())
+    return " ".join(re.findall(r"[a-z0-9]+", question.lower()))
+
+
+def shingles(normalized, size=3):
+    words = normalized.split()
+    if len(words) < size:
+        return {tuple(words)}
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def is_near_duplicate(candidate_shingles, existing_shingles, threshold=DUPLICATE_THRESHOLD):
+    for other in existing_shingles:
+        union = len(candidate_shingles | other)
+        if union and len(candidate_shingles & other) / union >= threshold:
+            return True
+    return False
+
+
+def parse_question_list(text):
+    """Parses an LLM reply that should be a JSON array of strings, falling back to one question per line."""
+    match = re.search(r"\[.*\]", text, re.DOTALL)
+    if match:
+        try:
+            items = json.loads(match.group(0))
+            if isinstance(items, list):
+                return [str(item).strip() for item in items if str(item).strip()]
+        except json.JSONDecodeError:
+            pass
+    return [line.strip() for line in text.splitlines() if line.strip().endswith("?")]
+
+
+def make_llm_generator(llm):
+    """Wraps a LangChain chat model into a `generate(role, topic, difficulty, count)` batch generator."""
+    def generate(role, topic, difficulty, count):
+        prompt = (
+            f"Generate {count} distinct interview questions for the role of {role} on the topic of {topic} "
+            f"with difficulty level {difficulty}. Cover different sub-areas of the topic. "
+            "Reply with only a JSON array of strings, one question per element."
+        )
+        return parse_question_list(llm.invoke(prompt).content)
+    return generate
+
+
+class QuestionBank:
+    """SQLite-backed pools of pre-generated questions per (role, topic, difficulty).
+
+    `draw` never calls the LLM; pools that run low are queued for a background refill
+    that uses `generate(role, topic, difficulty, count)` and drops near-duplicates.
+    """
+
+    def __init__(self, db_path=QUESTION_BANK_DB, generate=None):
+        self.db_path = db_path
+        self.generate = generate
+        self._refill_queue = Queue()
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._worker = None
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per operation keeps the bank safe to use from any thread
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def pool_size(self, role, topic, difficulty, fresh_only=False):
+        query = "SELECT COUNT(*) FROM questions WHERE role = ? AND topic = ? AND difficulty = ?"
+        params = [role, topic, difficulty]
+        if fresh_only:
+            query += " AND times_served < ?"
+            params.append(MAX_SERVES_PER_QUESTION)
+        with self._connect() as conn:
+            return conn.execute(query, params).fetchone()[0]
+
+    def draw(self, role, topic, difficulty, count, exclude=()):
+        """Returns up to `count` pooled questions, least-served first, and schedules a refill if the pool is low.
+
+        Questions in `exclude` (e.g. those already in the interview) are skipped; only the
+        questions returned count as served.
+        """
+        exclude = [question for question in exclude if question]
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, question FROM questions WHERE role = ? AND topic = ? AND difficulty = ? "
+                f"AND question NOT IN ({', '.join('?' * len(exclude))}) "
+                "ORDER BY times_served, RANDOM() LIMIT ?",
+                (role, topic, difficulty, *exclude, count),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE questions SET times_served = times_served + 1 WHERE id = ?",
+                [(row[0],) for row in rows],
+            )
+        if self.pool_size(role, topic, difficulty, fresh_only=True) < LOW_WATERMARK:
+            self.schedule_refill(role, topic, difficulty)
+        return [row[1] for row in rows]
+
+    def add(self, role, topic, difficulty, questions):
+        """Stores the questions that are not near-duplicates of the pool (or of each other). Returns how many were kept."""
+        with self._connect() as conn:
+            existing = [
+                shingles(row[0])
+                for row in conn.execute(
+                    "SELECT normalized FROM questions WHERE role = ? AND topic = ? AND difficulty = ?",
+                    (role, topic, difficulty),
+                )
+            ]
+            added = 0
+            for question in questions:
+                normalized = normalize_question(question)
+                if not normalized:
+                    continue
+                candidate = shingles(normalized)
+                if is_near_duplicate(candidate, existing):
+                    continue
+                conn.execute(
+                    "INSERT OR IGNORE INTO questions (role, topic, difficulty, question, normalized, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (role, topic, difficulty, question.strip(), normalized, time.time()),
+                )
+                existing.append(candidate)
+                added += 1
+        return added
+
+    def refill(self, role, topic, difficulty):
+        """Generates questions until the pool has TARGET_POOL_SIZE fresh entries (or the attempts run out)."""
+        for _ in range(MAX_REFILL_ATTEMPTS):
+            missing = TARGET_POOL_SIZE - self.pool_size(role, topic, difficulty, fresh_only=True)
+            if missing <= 0:
+                break
+            self.add(role, topic, difficulty, self.generate(role, topic, difficulty, min(missing, REFILL_BATCH_SIZE)))
+
+    def schedule_refill(self, role, topic, difficulty):
+        if self.generate is None:
+            return
+        key = (role, topic, difficulty)
+        with self._pending_lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._refill_loop, name="question-bank-refill", daemon=True)
+                self._worker.start()
+        self._refill_queue.put(key)
+
+    def _refill_loop(self):
+        while True:
+            key = self._refill_queue.get()
+            try:
+                self.refill(*key)
+            except Exception as e:
+                logging.error(f"Error refilling question pool {key}: {e}", exc_info=True)
+            finally:
+                with self._pending_lock:
+                    self._pending.discard(key)
+
+
+def main():
+    """Pre-generates every (role, topic, difficulty) pool so interviews never wait on the LLM."""
+    from llm_backend import LLM_BACKEND, FakeLLM
+
+    if LLM_BACKEND == "fake":
+        llm = FakeLLM()
+    else:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        llm = ChatGoogleGenerativeAI(model="gemini-pro", google_api_key=os.environ["GOOGLE_API_KEY"])
+    bank = QuestionBank(generate=make_llm_generator(llm))
+    for role, topics in ROLES_AND_TOPICS.items():
+        for topic in topics:
+            for difficulty in DIFFICULTY_LEVELS:
+                try:
+                    bank.refill(role, topic, difficulty)
+                    print(f"{role} / {topic} / {difficulty}: {bank.pool_size(role, topic, difficulty)} questions")
+                except Exception as e:
+                    print(f"Error generating questions for {role} / {topic} / {difficulty}: {e}")
+
+
+if __name__ == "__main__":
+    main()
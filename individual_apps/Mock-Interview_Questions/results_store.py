@@ -0,0 +1,163 @@
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+INTERVIEW_RESULTS_DB = os.getenv(
+    "INTERVIEW_RESULTS_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "interview_results.db")
+)
+
+# Raw answers and interviews are append-only. The *_stats tables are rollups kept
+# current in the same transaction as each append, so the dashboard never scans history.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS interviews (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user TEXT NOT NULL,
+    role TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    questions INTEGER NOT NULL,
+    average_score REAL NOT NULL,
+    completed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_interviews_user_time ON interviews (user, completed_at);
+
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    interview_id INTEGER NOT NULL REFERENCES interviews (id),
+    question_index INTEGER NOT NULL,
+    score INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS user_stats (
+    user TEXT PRIMARY KEY,
+    interviews INTEGER NOT NULL,
+    answers INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    best_interview_score REAL NOT NULL,
+    last_completed_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS topic_stats (
+    user TEXT NOT NULL,
+    role TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    interviews INTEGER NOT NULL,
+    answers INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    last_average_score REAL NOT NULL,
+    last_completed_at REAL NOT NULL,
+    PRIMARY KEY (user, role, topic, difficulty)
+);
+"""
+
+
+class ResultsStore:
+    """Append-only store of completed mock interviews with incrementally maintained per-user rollups."""
+
+    def __init__(self, db_path=INTERVIEW_RESULTS_DB):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record_interview(self, user, role, topic, difficulty, scores, completed_at=None):
+        """Appends one finished interview and folds it into the rollups. Returns the interview id.
+
+        A score of None marks an answer whose evaluation failed. It is left out of the answers
+        and every average (`questions` still counts it), and an interview without a single
+        graded answer is not recorded at all, so None is returned.
+        """
+        completed_at = completed_at or time.time()
+        graded = [(i, score) for i, score in enumerate(scores) if score is not None]
+        if not graded:
+            return None
+        score_sum = float(sum(score for _, score in graded))
+        average = score_sum / len(graded)
+        with self._connect() as conn:
+            interview_id = conn.execute(
+                "INSERT INTO interviews (user, role, topic, difficulty, questions, average_score, completed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (user, role, topic, difficulty, len(scores), average, completed_at),
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO answers (interview_id, question_index, score) VALUES (?, ?, ?)",
+                [(interview_id, i, score) for i, score in graded],
+            )
+            conn.execute(
+                "INSERT INTO user_stats (user, interviews, answers, score_sum, best_interview_score, last_completed_at) "
+                "VALUES (?, 1, ?, ?, ?, ?) "
+                "ON CONFLICT (user) DO UPDATE SET "
+                "interviews = interviews + 1, answers = answers + excluded.answers, "
+                "score_sum = score_sum + excluded.score_sum, "
+                "best_interview_score = MAX(best_interview_score, excluded.best_interview_score), "
+                "last_completed_at = MAX(last_completed_at, excluded.last_completed_at)",
+                (user, len(graded), score_sum, average, completed_at),
+            )
+            conn.execute(
+                "INSERT INTO topic_stats (user, role, topic, difficulty, interviews, answers, score_sum, "
+                "last_average_score, last_completed_at) VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?) "
+                "ON CONFLICT (user, role, topic, difficulty) DO UPDATE SET "
+                "interviews = interviews + 1, answers = answers + excluded.answers, "
+                "score_sum = score_sum + excluded.score_sum, "
+                "last_average_score = CASE WHEN excluded.last_completed_at >= last_completed_at "
+                "THEN excluded.last_average_score ELSE last_average_score END, "
+                "last_completed_at = MAX(last_completed_at, excluded.last_completed_at)",
+                (user, role, topic, difficulty, len(graded), score_sum, average, completed_at),
+            )
+        return interview_id
+
+    def user_summary(self, user):
+        """Headline numbers for a user from a single rollup row, or None if they have no interviews."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM user_stats WHERE user = ?", (user,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "interviews": row["interviews"],
+            "answers": row["answers"],
+            "average_score": row["score_sum"] / row["answers"] if row["answers"] else 0.0,
+            "best_interview_score": row["best_interview_score"],
+            "last_completed_at": row["last_completed_at"],
+        }
+
+    def score_series(self, user, limit=50):
+        """Average score of the user's most recent `limit` interviews, oldest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT completed_at, average_score FROM interviews WHERE user = ? "
+                "ORDER BY completed_at DESC LIMIT ?",
+                (user, limit),
+            ).fetchall()
+        return [(row["completed_at"], row["average_score"]) for row in reversed(rows)]
+
+    def topic_averages(self, user):
+        """Per (role, topic, difficulty) averages for a user, read straight from the rollup."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT role, topic, difficulty, interviews, answers, score_sum, last_average_score "
+                "FROM topic_stats WHERE user = ? ORDER BY role, topic, difficulty",
+                (user,),
+            ).fetchall()
+        return [
+            {
+                "role": row["role"],
+                "topic": row["topic"],
+                "difficulty": row["difficulty"],
+                "interviews": row["interviews"],
+                "average_score": row["score_sum"] / row["answers"] if row["answers"] else 0.0,
+                "last_score": row["last_average_score"],
+            }
+            for row in rows
+        ]